@@ -19,16 +19,20 @@ Features:
 """
 
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, scrolledtext
+from tkinter import ttk, filedialog, messagebox
 import threading
-import json
+import asyncio
 import os
+import queue
+import shutil
 import sys
+import tempfile
 import time
-from datetime import datetime
+import warnings
 from typing import Optional, Dict, Any
 
 try:
+    from google.auth.transport.requests import Request
     from google.cloud import speech
     from google.oauth2 import service_account
 except ImportError:
@@ -46,10 +50,27 @@ except ImportError:
                         "Install with: pip install pyaudio")
     sys.exit(1)
 
+try:
+    # Only non-16 kHz audio needs it; gone in Python 3.13
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        import audioop
+except ImportError:
+    audioop = None
+
 
 class GoogleSTTGUI:
     """Google Speech-to-Text GUI Application"""
     
+    # Rows kept in the transcription view before the oldest are trimmed
+    MAX_LINES = 2000
+    
+    # Scope requested when validating credentials with a token exchange
+    CLOUD_PLATFORM_SCOPE = "https://www.googleapis.com/auth/cloud-platform"
+    
+    # Interim results less stable than this are not shown
+    MIN_INTERIM_STABILITY = 0.3
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Google Speech-to-Text Test")
@@ -63,10 +84,33 @@ class GoogleSTTGUI:
         self.responses = None
         self.is_recording = False
         self.audio_stream = None
-        self.audio = None
+        self.audio = pyaudio.PyAudio()
+        self._mic_rate = None
+        self._client_cache = {}
+        self._config_cache = {}
+        self._last_interim = ''
+        self._interim_item = None
+        self._row_count = 0
+        self._ts_sec = None
+        self._ts_str = ''
+        self._session = None
+        
+        # Event loop running the streaming recognition sessions
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        
+        # Results handed from the event loop thread to the Tk thread
+        self._ui_queue = queue.Queue()
+        
+        # Final results are appended here as they arrive; saving copies this file
+        self._log_fp = None
+        self._log_path = None
         
         # Status
         self.status_var = tk.StringVar(value="Ready")
+        self._pending_status = None
+        self._status_job = None
+        self._last_status_time = 0.0
         
         # GUI components
         self.setup_gui()
@@ -107,6 +151,9 @@ class GoogleSTTGUI:
         # Status bar
         self.setup_status_bar(main_frame, 6)
         
+        # Start polling for transcription results
+        self.root.after(50, self._drain_queue)
+        
     def setup_credentials_section(self, parent, row):
         """Setup credentials selection section"""
         # Credentials frame
@@ -129,6 +176,10 @@ class GoogleSTTGUI:
         ttk.Button(cred_frame, text="Test Connection", 
                   command=self.test_credentials).grid(row=0, column=3, padx=(10, 0))
         
+        # Verify button (full recognition request)
+        ttk.Button(cred_frame, text="Verify API", 
+                  command=self.verify_api).grid(row=0, column=4, padx=(10, 0))
+        
     def setup_language_section(self, parent, row):
         """Setup language selection section"""
         # Language frame
@@ -208,16 +259,37 @@ class GoogleSTTGUI:
         trans_frame.rowconfigure(0, weight=1)
         parent.rowconfigure(row, weight=1)
         
-        # Text display
-        self.transcription_text = scrolledtext.ScrolledText(trans_frame, height=15, width=80,
-                                                           font=('Consolas', 10))
-        self.transcription_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        
-        # Configure text tags for formatting
-        self.transcription_text.tag_configure("final", foreground="green", font=('Consolas', 10, 'bold'))
-        self.transcription_text.tag_configure("interim", foreground="orange", font=('Consolas', 10))
-        self.transcription_text.tag_configure("timestamp", foreground="blue", font=('Consolas', 9))
-        self.transcription_text.tag_configure("confidence", foreground="purple", font=('Consolas', 9))
+        # Row display; Treeview only renders the visible rows
+        self.transcription_tree = ttk.Treeview(trans_frame, columns=("time", "confidence", "text"),
+                                               show="headings", height=15)
+        self.transcription_tree.heading("time", text="Time")
+        self.transcription_tree.heading("confidence", text="Confidence")
+        self.transcription_tree.heading("text", text="Transcript")
+        self.transcription_tree.column("time", width=80, stretch=False)
+        self.transcription_tree.column("confidence", width=90, stretch=False)
+        self.transcription_tree.column("text", width=560)
+        self.transcription_tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        scrollbar = ttk.Scrollbar(trans_frame, orient=tk.VERTICAL, command=self.transcription_tree.yview)
+        scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.transcription_tree.configure(yscrollcommand=scrollbar.set)
+        
+        # Long transcripts are clipped by the column, so the selected row is shown in full below
+        self.selected_text_var = tk.StringVar()
+        selected_label = ttk.Label(trans_frame, textvariable=self.selected_text_var, anchor=tk.W)
+        selected_label.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(5, 0))
+        selected_label.bind("<Configure>", lambda e: selected_label.configure(wraplength=e.width))
+        self.transcription_tree.bind("<<TreeviewSelect>>", self._show_selected_text)
+        
+        # Configure row tags for formatting
+        self.transcription_tree.tag_configure("final", foreground="green", font=('Consolas', 10, 'bold'))
+        self.transcription_tree.tag_configure("interim", foreground="orange", font=('Consolas', 10))
+        
+    def _show_selected_text(self, event=None):
+        """Show the full transcript of the selected row"""
+        selection = self.transcription_tree.selection()
+        if selection:
+            self.selected_text_var.set(self.transcription_tree.set(selection[0], "text"))
         
     def setup_status_bar(self, parent, row):
         """Setup status bar"""
@@ -260,43 +332,40 @@ class GoogleSTTGUI:
         else:
             self.file_frame.grid_remove()
             
-    def test_credentials(self):
-        """Test Google credentials"""
+    def _selected_credentials(self):
+        """Return the selected credentials path, or None if it is unusable"""
         creds_path = self.creds_path_var.get()
         if not creds_path:
             messagebox.showerror("Error", "Please select a credentials file")
-            return
+            return None
             
         if not os.path.exists(creds_path):
             messagebox.showerror("Error", "Credentials file not found")
+            return None
+            
+        return creds_path
+        
+    def test_credentials(self):
+        """Test Google credentials with an OAuth token exchange"""
+        creds_path = self._selected_credentials()
+        if not creds_path:
             return
             
+        self.update_status("Testing credentials...")
+        self._submit(asyncio.to_thread(self._refresh_token, creds_path), self._on_credentials_tested)
+        
+    def _refresh_token(self, creds_path):
+        """Exchange the service account key for an access token"""
+        creds = service_account.Credentials.from_service_account_file(
+            creds_path, scopes=[self.CLOUD_PLATFORM_SCOPE])
+        
+        # This will fail gracefully if credentials are invalid
+        creds.refresh(Request())
+        
+    def _on_credentials_tested(self, future):
+        """Report the result of test_credentials"""
         try:
-            self.update_status("Testing credentials...")
-            
-            # Load credentials
-            with open(creds_path, 'r') as f:
-                credentials = json.load(f)
-                
-            # Create credentials object
-            creds = service_account.Credentials.from_service_account_info(credentials)
-            
-            # Initialize client
-            client = speech.SpeechClient(credentials=creds)
-            
-            # Test with a simple request
-            config = speech.RecognitionConfig(
-                encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
-                sample_rate_hertz=16000,
-                language_code="en-US",
-            )
-            
-            # Create a minimal audio (silence)
-            audio = speech.RecognitionAudio(content=b'\x00' * 3200)  # 0.1 seconds of silence
-            
-            # This will fail gracefully if credentials are invalid
-            client.recognize(config=config, audio=audio)
-            
+            future.result()
             messagebox.showinfo("Success", "Credentials are valid!")
             self.update_status("Credentials validated")
             
@@ -304,35 +373,81 @@ class GoogleSTTGUI:
             messagebox.showerror("Error", f"Credentials test failed: {str(e)}")
             self.update_status("Credentials test failed")
             
-    def initialize_stt_client(self):
-        """Initialize STT client"""
-        creds_path = self.creds_path_var.get()
-        if not creds_path or not os.path.exists(creds_path):
-            messagebox.showerror("Error", "Please select a valid credentials file")
-            return False
+    def verify_api(self):
+        """Verify Speech-to-Text access with a minimal recognition request"""
+        creds_path = self._selected_credentials()
+        if not creds_path:
+            return
             
+        self.update_status("Verifying Speech-to-Text API...")
+        self._submit(self._recognize_silence(creds_path), self._on_api_verified)
+        
+    def _on_api_verified(self, future):
+        """Report the result of verify_api"""
         try:
-            # Load credentials
-            with open(creds_path, 'r') as f:
-                credentials = json.load(f)
-                
-            # Create credentials object
-            creds = service_account.Credentials.from_service_account_info(credentials)
+            future.result()
+            messagebox.showinfo("Success", "Speech-to-Text API is reachable!")
+            self.update_status("API verified")
             
+        except Exception as e:
+            messagebox.showerror("Error", f"API verification failed: {str(e)}")
+            self.update_status("API verification failed")
+            
+    async def _recognize_silence(self, creds_path):
+        """Send a minimal recognition request with the given credentials"""
+        # Initialize client
+        client = await self._get_client(creds_path)
+        
+        # Test with a simple request
+        config = speech.RecognitionConfig(
+            encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
+            sample_rate_hertz=16000,
+            language_code="en-US",
+        )
+        
+        # Create a minimal audio (silence)
+        audio = speech.RecognitionAudio(content=b'\x00' * 3200)  # 0.1 seconds of silence
+        
+        await client.recognize(config=config, audio=audio)
+        
+    async def _get_client(self, creds_path):
+        """Return a Speech client for the credentials file, reusing it until the file changes"""
+        # Async clients are bound to the loop they are created on, so this runs on self._loop
+        key = (creds_path, os.path.getmtime(creds_path))
+        client = self._client_cache.get(key)
+        if client is None:
+            creds = await asyncio.to_thread(
+                service_account.Credentials.from_service_account_file, creds_path)
+            client = speech.SpeechAsyncClient(credentials=creds)
+            self._client_cache = {key: client}
+        return client
+        
+    def _submit(self, coro, callback):
+        """Run a coroutine on the event loop and pass its future to callback on the Tk thread"""
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        future.add_done_callback(lambda f: self.root.after(0, callback, f))
+        
+    def initialize_stt_client(self, future):
+        """Initialize STT client from a finished client build"""
+        try:
             # Initialize client
-            self.client = speech.SpeechClient(credentials=creds)
-            
-            # Configure streaming recognition
-            self.streaming_config = speech.StreamingRecognitionConfig(
-                config=speech.RecognitionConfig(
-                    encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
-                    sample_rate_hertz=16000,
-                    language_code=self.language_var.get(),
-                    enable_automatic_punctuation=True,
-                    enable_word_time_offsets=True,
-                ),
-                interim_results=True,
-            )
+            self.client = future.result()
+            
+            # Configure streaming recognition (built once per language)
+            language = self.language_var.get()
+            self.streaming_config = self._config_cache.get(language)
+            if self.streaming_config is None:
+                self.streaming_config = speech.StreamingRecognitionConfig(
+                    config=speech.RecognitionConfig(
+                        encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
+                        sample_rate_hertz=16000,
+                        language_code=language,
+                        enable_automatic_punctuation=True,
+                        enable_word_time_offsets=True,
+                    ),
+                    interim_results=True,
+                )
+                self._config_cache[language] = self.streaming_config
             
             return True
             
@@ -348,22 +463,38 @@ class GoogleSTTGUI:
             self.stop_recording()
             
     def start_recording(self):
-        """Start recording"""
-        if not self.initialize_stt_client():
+        """Start recording once the STT client is ready"""
+        creds_path = self.creds_path_var.get()
+        if not creds_path or not os.path.exists(creds_path):
+            messagebox.showerror("Error", "Please select a valid credentials file")
+            return
+            
+        # Build the client off the Tk thread
+        self.start_button.config(state=tk.DISABLED)
+        self.update_status("Connecting...")
+        self._submit(self._get_client(creds_path), self._on_client_ready)
+        
+    def _on_client_ready(self, future):
+        """Begin recording once the STT client has been built"""
+        self.start_button.config(state=tk.NORMAL)
+        if not self.initialize_stt_client(future):
+            self.update_status("Ready")
             return
             
         self.is_recording = True
+        if self._log_fp is None:
+            fd, self._log_path = tempfile.mkstemp(suffix='.txt')
+            self._log_fp = os.fdopen(fd, 'w', encoding='utf-8', buffering=1)
         self.start_button.config(text="Stop Recording")
         self.update_status("Recording...")
         
-        # Start recording in separate thread
+        # Start recording on the event loop
         if self.audio_type_var.get() == "microphone":
-            self.recording_thread = threading.Thread(target=self.record_microphone)
+            session = self.record_microphone()
         else:
-            self.recording_thread = threading.Thread(target=self.record_file)
+            session = self.record_file()
             
-        self.recording_thread.daemon = True
-        self.recording_thread.start()
+        self._session = asyncio.run_coroutine_threadsafe(session, self._loop)
         
     def stop_recording(self):
         """Stop recording"""
@@ -371,91 +502,133 @@ class GoogleSTTGUI:
         self.start_button.config(text="Start Recording")
         self.update_status("Stopped")
         
-        # Stop audio stream
-        if self.audio_stream:
+        # Cancel the streaming session
+        if self._session:
+            self._session.cancel()
+            self._session = None
+        
+        # Pause audio stream; it stays open for the next recording
+        if self.audio_stream and self.audio_stream.is_active():
             self.audio_stream.stop_stream()
-            self.audio_stream.close()
-            self.audio_stream = None
-            
-        if self.audio:
-            self.audio.terminate()
-            self.audio = None
             
-    def record_microphone(self):
+    async def record_microphone(self):
         """Record from microphone"""
         try:
-            # Audio configuration
-            CHUNK = 1024
-            FORMAT = pyaudio.paInt16
-            CHANNELS = 1
-            RATE = 16000
-            
-            # Initialize PyAudio
-            self.audio = pyaudio.PyAudio()
-            
-            # Open microphone stream
-            self.audio_stream = self.audio.open(
-                format=FORMAT,
-                channels=CHANNELS,
-                rate=RATE,
-                input=True,
-                frames_per_buffer=CHUNK
-            )
+            # Capture state shared with the PortAudio callback
+            self._audio_q = asyncio.Queue()
+            self._mic_buffer = bytearray()
+            self._rc_state = None
+            
+            # Open the microphone stream once and reuse it across recordings
+            if self.audio_stream is None:
+                # Audio configuration: capture at the device's native rate (~64 ms buffers)
+                FORMAT = pyaudio.paInt16
+                CHANNELS = 1
+                RATE = int(self.audio.get_default_input_device_info()['defaultSampleRate'])
+                CHUNK = int(RATE * 0.064)
+                if RATE != 16000 and audioop is None:
+                    raise RuntimeError(f"Resampling the {RATE} Hz microphone needs audioop (Python < 3.13)")
+                
+                # PortAudio delivers buffers through the callback
+                self.audio_stream = self.audio.open(
+                    format=FORMAT,
+                    channels=CHANNELS,
+                    rate=RATE,
+                    input=True,
+                    frames_per_buffer=CHUNK,
+                    stream_callback=self._audio_callback,
+                    start=False
+                )
+                self._mic_rate = RATE
+                
+            self.audio_stream.start_stream()
             
             # Start streaming recognition
-            self.requests = (speech.StreamingRecognizeRequest(audio_content=chunk)
-                           for chunk in self.audio_generator(self.audio_stream, CHUNK))
-            
-            self.responses = self.client.streaming_recognize(self.streaming_config, self.requests)
-            
-            # Process responses
-            self.process_responses()
+            await self.stream_recognize(self.audio_generator())
             
         except Exception as e:
-            self.root.after(0, lambda: messagebox.showerror("Error", f"Microphone recording failed: {str(e)}"))
-            self.root.after(0, self.stop_recording)
+            self.root.after(0, self._report_error, f"Microphone recording failed: {e}")
             
-    def record_file(self):
+    async def record_file(self):
         """Record from audio file"""
         file_path = self.audio_file_var.get()
         if not file_path or not os.path.exists(file_path):
-            self.root.after(0, lambda: messagebox.showerror("Error", "Please select a valid audio file"))
-            self.root.after(0, self.stop_recording)
+            self.root.after(0, self._report_error, "Please select a valid audio file")
             return
             
         try:
-            # Read audio file
+            # Stream audio file
             with wave.open(file_path, 'rb') as audio_file:
-                frames = audio_file.readframes(-1)
-                sample_rate = audio_file.getframerate()
-                
-                # Convert to chunks
-                chunk_size = 1024 * 2  # 1024 samples * 2 bytes per sample
-                audio_chunks = [frames[i:i+chunk_size] for i in range(0, len(frames), chunk_size)]
-                
+                if audio_file.getsampwidth() != 2 or audio_file.getnchannels() != 1:
+                    raise ValueError("Only 16-bit mono WAV files are supported")
+                if audio_file.getframerate() != 16000 and audioop is None:
+                    raise ValueError(f"Resampling {audio_file.getframerate()} Hz audio needs audioop "
+                                     "(Python < 3.13); convert the file to 16000 Hz first")
+                    
                 # Start streaming recognition
-                self.requests = (speech.StreamingRecognizeRequest(audio_content=chunk)
-                               for chunk in audio_chunks)
-                
-                self.responses = self.client.streaming_recognize(self.streaming_config, self.requests)
-                
-                # Process responses
-                self.process_responses()
+                await self.stream_recognize(self.file_generator(audio_file, audio_file.getframerate() // 10))
                 
         except Exception as e:
-            self.root.after(0, lambda: messagebox.showerror("Error", f"Audio file processing failed: {str(e)}"))
-            self.root.after(0, self.stop_recording)
-            
-    def audio_generator(self, stream, chunk_size):
-        """Generate audio chunks from microphone stream"""
+            self.root.after(0, self._report_error, f"Audio file processing failed: {e}")
+            
+    def _audio_callback(self, in_data, frame_count, time_info, status):
+        """Resample and batch captured audio on the PortAudio thread"""
+        if self._mic_rate != 16000:
+            in_data, self._rc_state = audioop.ratecv(in_data, 2, 1, self._mic_rate, 16000, self._rc_state)
+            
+        # 3200 bytes is 100 ms of 16-bit audio at 16 kHz
+        self._mic_buffer += in_data
+        if len(self._mic_buffer) >= 3200:
+            self._loop.call_soon_threadsafe(self._audio_q.put_nowait, bytes(self._mic_buffer))
+            self._mic_buffer.clear()
+        return (None, pyaudio.paContinue)
+        
+    async def audio_generator(self):
+        """Generate ~100 ms chunks of 16 kHz audio from microphone stream"""
         while self.is_recording:
-            data = stream.read(chunk_size, exception_on_overflow=False)
+            try:
+                yield await asyncio.wait_for(self._audio_q.get(), timeout=1.0)
+            except asyncio.TimeoutError:
+                continue
+            
+    async def file_generator(self, audio_file, chunk_size):
+        """Generate 16 kHz audio chunks from a WAV file, paced to real time"""
+        sample_rate = audio_file.getframerate()
+        state = None
+        next_send = time.monotonic()
+        while self.is_recording:
+            data = audio_file.readframes(chunk_size)
+            if not data:
+                return
+            if sample_rate != 16000:
+                data, state = audioop.ratecv(data, 2, 1, sample_rate, 16000, state)
+                
+            # Release each chunk when its audio would have been captured live
+            delay = next_send - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            next_send += len(data) / (2 * 16000)
             yield data
             
-    def process_responses(self):
+    async def stream_recognize(self, chunks):
+        """Stream audio chunks to Google STT and process the responses"""
+        async def requests():
+            # The async client expects the config as the first request
+            yield speech.StreamingRecognizeRequest(streaming_config=self.streaming_config)
+            async for chunk in chunks:
+                yield speech.StreamingRecognizeRequest(audio_content=chunk)
+                
+        # Requests are sent by gRPC while responses are consumed here
+        self.requests = requests()
+        self.responses = await self.client.streaming_recognize(requests=self.requests)
+        
+        # Process responses
+        await self.process_responses()
+        
+    async def process_responses(self):
         """Process streaming recognition responses"""
         try:
-            for response in self.responses:
+            async for response in self.responses:
                 if not self.is_recording:
                     break
                     
@@ -467,42 +640,102 @@ class GoogleSTTGUI:
                     continue
                 
                 transcript = result.alternatives[0].transcript
+                if not transcript.strip():
+                    continue
                 confidence = result.alternatives[0].confidence
                 is_final = result.is_final
                 
-                # Update GUI in main thread
-                self.root.after(0, lambda: self.update_transcription(transcript, confidence, is_final))
+                # Skip unstable or repeated interim hypotheses; Google only reports
+                # confidence on final results, so interims are judged by stability
+                # (0.0 means it was not reported, so those are kept)
+                if not is_final:
+                    if 0.0 < result.stability < self.MIN_INTERIM_STABILITY or transcript == self._last_interim:
+                        continue
+                    self._last_interim = transcript
+                else:
+                    self._last_interim = ''
+                
+                # Hand off to the GUI thread
+                self._ui_queue.put_nowait((transcript, confidence, is_final, time.time()))
                 
         except Exception as e:
-            self.root.after(0, lambda: messagebox.showerror("Error", f"Response processing failed: {str(e)}"))
-            self.root.after(0, self.stop_recording)
+            self.root.after(0, self._report_error, f"Response processing failed: {e}")
             
-    def update_transcription(self, transcript, confidence, is_final):
-        """Update transcription display"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        conf_str = f"({confidence:.2f})" if confidence else "(N/A)"
-        
-        # Insert timestamp
-        self.transcription_text.insert(tk.END, f"[{timestamp}] ", "timestamp")
+    def _report_error(self, message):
+        """Stop recording and show an error raised off the Tk thread"""
+        self.stop_recording()
+        messagebox.showerror("Error", message)
         
-        # Insert confidence
-        self.transcription_text.insert(tk.END, f"{conf_str} ", "confidence")
-        
-        # Insert transcript with appropriate tag
+    def _drain_queue(self):
+        """Flush pending transcription results into the display"""
+        results = []
+        try:
+            while True:
+                results.append(self._ui_queue.get_nowait())
+        except queue.Empty:
+            pass
+            
+        if results:
+            self.update_transcription(results)
+            
+        self.root.after(50, self._drain_queue)
+        
+    def _format_result(self, transcript, confidence, is_final, ts):
+        """Build the row values and tag for one transcription result"""
+        # Results within the same wall-clock second share one formatted timestamp
+        sec = int(ts)
+        if sec != self._ts_sec:
+            self._ts_sec, self._ts_str = sec, time.strftime("%H:%M:%S", time.localtime(sec))
+        timestamp = self._ts_str
+        conf_str = f"({confidence:.2f})" if confidence else "(N/A)"
         tag = "final" if is_final else "interim"
-        self.transcription_text.insert(tk.END, f"{transcript}\n", tag)
+        return (timestamp, conf_str, transcript), tag
+        
+    def update_transcription(self, results):
+        """Update transcription display"""
+        tree = self.transcription_tree
         
+        # Any newer result supersedes the interim row currently on screen
+        if self._interim_item:
+            tree.delete(self._interim_item)
+            self._interim_item = None
+            
+        # Finals are appended; only a trailing interim is still current
+        finals = [self._format_result(*result) for result in results if result[2]]
+        for values, tag in finals:
+            last_item = tree.insert('', tk.END, values=values, tags=(tag,))
+        if finals:
+            self._row_count += len(finals)
+            self._log_fp.write("".join("[%s] %s %s\n" % values for values, _ in finals))
+            
+        if not results[-1][2]:
+            values, tag = self._format_result(*results[-1])
+            last_item = self._interim_item = tree.insert('', tk.END, values=values, tags=(tag,))
+            
         # Scroll to bottom
-        self.transcription_text.see(tk.END)
+        tree.see(last_item)
         
+        # Trim the oldest rows once the display exceeds MAX_LINES
+        overflow = self._row_count - self.MAX_LINES
+        if overflow > 0:
+            tree.delete(*tree.get_children()[:overflow])
+            self._row_count = self.MAX_LINES
+            
     def clear_transcription(self):
         """Clear transcription text"""
-        self.transcription_text.delete(1.0, tk.END)
+        self.transcription_tree.delete(*self.transcription_tree.get_children())
+        self.selected_text_var.set("")
+        self._interim_item = None
+        self._row_count = 0
+        if self._log_fp:
+            self._log_fp.seek(0)
+            self._log_fp.truncate()
         
     def save_transcript(self):
         """Save transcription to file"""
-        content = self.transcription_text.get(1.0, tk.END)
-        if not content.strip():
+        if self._log_fp:
+            self._log_fp.flush()
+        if not self._log_path or os.path.getsize(self._log_path) == 0:
             messagebox.showwarning("Warning", "No transcription to save")
             return
             
@@ -514,20 +747,39 @@ class GoogleSTTGUI:
         
         if filename:
             try:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                shutil.copyfile(self._log_path, filename)
                 messagebox.showinfo("Success", f"Transcription saved to {filename}")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to save file: {str(e)}")
                 
     def update_status(self, message):
-        """Update status bar"""
-        self.status_var.set(message)
+        """Update status bar, coalescing updates that arrive within 100 ms"""
+        self._pending_status = message
+        if self._status_job is None:
+            wait = self._last_status_time + 0.1 - time.monotonic()
+            if wait <= 0:
+                self._flush_status()
+            else:
+                self._status_job = self.root.after(int(wait * 1000), self._flush_status)
+                
+    def _flush_status(self):
+        """Apply the most recent status message"""
+        self._status_job = None
+        if self._pending_status != self.status_var.get():
+            self.status_var.set(self._pending_status)
+            self._last_status_time = time.monotonic()
         
     def on_closing(self):
         """Handle window closing"""
         if self.is_recording:
             self.stop_recording()
+        if self.audio_stream:
+            self.audio_stream.close()
+        self.audio.terminate()
+        if self._log_fp:
+            self._log_fp.close()
+            os.remove(self._log_path)
+        self._loop.call_soon_threadsafe(self._loop.stop)
         self.root.destroy()
 
 
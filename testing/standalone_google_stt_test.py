@@ -19,13 +19,19 @@ Features:
 import argparse
 import asyncio
 import base64
+import collections
+import functools
+import hashlib
 import json
+import math
 import os
+import queue
 import sys
 import tempfile
 import threading
 import time
-from datetime import datetime
+import wave
+import warnings
 from typing import Optional, Dict, Any
 
 try:
@@ -37,17 +43,17 @@ except ImportError:
     sys.exit(1)
 
 try:
-    import pyaudio
-    import wave
+    import sounddevice as sd
 except ImportError:
     print("❌ Missing audio dependencies.")
-    print("Install with: pip install pyaudio")
+    print("Install with: pip install sounddevice")
     sys.exit(1)
 
 try:
     import colorama
     from colorama import Fore, Back, Style
-    colorama.init()
+    # Terminals outside Windows understand ANSI natively, so stdout is left unwrapped
+    colorama.init(wrap=sys.platform == "win32")
 except ImportError:
     print("⚠️  Colorama not installed. Install with: pip install colorama")
     # Fallback colors
@@ -56,6 +62,26 @@ except ImportError:
     class Style:
         BRIGHT = RESET_ALL = ""
 
+try:
+    import webrtcvad
+except ImportError:
+    print("⚠️  webrtcvad not installed; silence will be streamed. Install with: pip install webrtcvad")
+    webrtcvad = None
+
+try:
+    # Deprecated since Python 3.11 and removed in 3.13; only resampling needs it
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        import audioop
+except ImportError:
+    audioop = None
+
+try:
+    import numpy as np
+except ImportError:
+    # Only used to speed up energy checks; they fall back to audioop or plain Python
+    np = None
+
 
 class Colors:
     """ANSI color codes for terminal output"""
@@ -67,18 +93,79 @@ class Colors:
     RESET = Style.RESET_ALL
 
 
+# Voice activity detection on the microphone stream
+VAD_FRAME_BYTES = 640          # 20 ms of 16-bit audio at 16 kHz
+VAD_PREROLL_CHUNKS = 3         # audio kept before speech onset so it isn't clipped
+VAD_HANGOVER_CHUNKS = 5        # audio still sent after speech stops
+VAD_KEEPALIVE_SECONDS = 5.0    # Google closes streams that go too long without audio
+SILENCE_RMS_THRESHOLD = 80     # without VAD, chunks quieter than this are sent as shared silence
+
+# Audio per streaming request; Google recommends ~100 ms, and fewer, larger chunks
+# mean fewer gRPC messages and HTTP/2 frames for the same audio
+DEFAULT_CHUNK_MS = 100
+MIN_CHUNK_MS = 20              # one VAD frame; shorter chunks are never checked for speech
+MAX_CHUNK_MS = 500             # well inside the 2 s microphone ring and Google's request size limit
+
+# Service account credentials keyed by a hash of their JSON, so the RSA key is parsed once;
+# unlike clients they aren't tied to an event loop, and an edited file hashes differently
+_service_account_cache: Dict[str, Any] = {}
+
+
+@functools.lru_cache(maxsize=32)
+def streaming_config_for(language: str):
+    """Build the streaming recognition config for a language (cached)"""
+    return speech.StreamingRecognitionConfig(
+        config=speech.RecognitionConfig(
+            encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
+            sample_rate_hertz=16000,
+            language_code=language,
+            enable_automatic_punctuation=True,
+            enable_word_time_offsets=True,
+        ),
+        interim_results=True,
+        enable_voice_activity_events=True,
+    )
+
+
+def contains_speech(vad, data: bytes) -> bool:
+    """Check whether any 20 ms frame of a chunk contains speech"""
+    return any(vad.is_speech(data[i:i + VAD_FRAME_BYTES], 16000)
+               for i in range(0, len(data) - VAD_FRAME_BYTES + 1, VAD_FRAME_BYTES))
+
+
+def chunk_rms(data: bytes) -> float:
+    """Root-mean-square level of a 16-bit PCM chunk"""
+    if np is None:
+        if audioop is not None:
+            return audioop.rms(data, 2)
+        samples = memoryview(data).cast('h')
+        return math.sqrt(sum(s * s for s in samples) / len(samples)) if samples else 0.0
+    # Zero-copy view over the chunk; the widening square is one vectorized pass
+    samples = np.frombuffer(data, dtype='<i2')
+    return float(np.sqrt(np.square(samples, dtype=np.int64).mean())) if samples.size else 0.0
+
+
 def print_colored(message: str, color: str = Colors.INFO):
     """Print colored message"""
-    print(f"{color}{message}{Colors.RESET}")
+    write = sys.stdout.write
+    write(color)
+    write(message)
+    write(Colors.RESET)
+    write("\n")
 
 
 def get_user_input(prompt: str, default: str = None) -> str:
     """Get user input with optional default"""
-    if default:
-        user_input = input(f"{prompt} [{default}]: ").strip()
-        return user_input if user_input else default
-    else:
-        return input(f"{prompt}: ").strip()
+    try:
+        if default:
+            user_input = input(f"{prompt} [{default}]: ").strip()
+            return user_input if user_input else default
+        else:
+            return input(f"{prompt}: ").strip()
+    except EOFError:
+        # stdin is exhausted (e.g. credentials pasted through a pipe), so fall back to the default
+        print()
+        return default or ""
 
 
 def load_google_credentials() -> Optional[Dict[str, Any]]:
@@ -108,21 +195,10 @@ def load_google_credentials() -> Optional[Dict[str, Any]]:
     
     elif choice == "2":
         # Direct JSON input
-        print("\nPaste your Google credentials JSON (press Enter twice when done):")
-        lines = []
-        empty_lines = 0
-        while True:
-            line = input()
-            if line.strip() == "":
-                empty_lines += 1
-                if empty_lines >= 2:
-                    break
-            else:
-                empty_lines = 0
-            lines.append(line)
+        print("\nPaste your Google credentials JSON, then press Ctrl-D (Unix) or Ctrl-Z+Enter (Windows):")
+        creds_json = sys.stdin.read()
         
         try:
-            creds_json = "\n".join(lines)
             return json.loads(creds_json)
         except Exception as e:
             print_colored(f"❌ Error parsing JSON: {e}", Colors.ERROR)
@@ -195,6 +271,56 @@ def select_audio_input() -> str:
     return "microphone"
 
 
+class AudioRingBuffer:
+    """Fixed-size byte ring written by the audio callback and drained by the request generator"""
+    
+    def __init__(self, size: int):
+        self._buffer = bytearray(size)
+        self._view = memoryview(self._buffer)
+        self._size = size
+        self._read_pos = 0
+        self._write_pos = 0
+        self._lock = threading.Lock()
+        self._data_ready = threading.Event()
+    
+    def write(self, data) -> None:
+        """Copy captured audio into the ring, overwriting the oldest audio on overflow"""
+        data = memoryview(data).cast("B")
+        if len(data) > self._size:
+            data = data[-self._size:]
+        n = len(data)
+        
+        with self._lock:
+            start = self._write_pos % self._size
+            first = min(n, self._size - start)
+            self._view[start:start + first] = data[:first]
+            self._view[:n - first] = data[first:]
+            self._write_pos += n
+            if self._write_pos - self._read_pos > self._size:
+                self._read_pos = self._write_pos - self._size
+        
+        self._data_ready.set()
+    
+    def read(self, n: int, timeout: float) -> Optional[bytes]:
+        """Return the next n bytes, or None if they are not available within timeout"""
+        while True:
+            with self._lock:
+                if self._write_pos - self._read_pos >= n:
+                    start = self._read_pos % self._size
+                    first = min(n, self._size - start)
+                    # Slicing the view is free; the bytes for the request are the only copy
+                    if first == n:
+                        data = self._view[start:start + n].tobytes()
+                    else:
+                        data = b"".join((self._view[start:], self._view[:n - first]))
+                    self._read_pos += n
+                    return data
+                self._data_ready.clear()
+            
+            if not self._data_ready.wait(timeout):
+                return None
+
+
 class GoogleSTTTester:
     """Google Speech-to-Text tester"""
     
@@ -202,33 +328,20 @@ class GoogleSTTTester:
         self.credentials = credentials
         self.language = language
         self.client = None
-        self.streaming_config = None
-        self.requests = None
-        self.responses = None
-        self.is_recording = False
         
-    def initialize(self) -> bool:
+    async def initialize(self) -> bool:
         """Initialize Google Speech client"""
         try:
             print_colored("🔧 Initializing Google Speech client...", Colors.INFO)
             
-            # Create credentials object
-            creds = service_account.Credentials.from_service_account_info(self.credentials)
-            
-            # Initialize client
-            self.client = speech.SpeechClient(credentials=creds)
-            
-            # Configure streaming recognition
-            self.streaming_config = speech.StreamingRecognitionConfig(
-                config=speech.RecognitionConfig(
-                    encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
-                    sample_rate_hertz=16000,
-                    language_code=self.language,
-                    enable_automatic_punctuation=True,
-                    enable_word_time_offsets=True,
-                ),
-                interim_results=True,
-            )
+            # The client's channel belongs to the running loop, so it is built per run;
+            # sessions created by this tester share it
+            key = hashlib.sha256(json.dumps(self.credentials, sort_keys=True).encode()).hexdigest()
+            creds = _service_account_cache.get(key)
+            if creds is None:
+                creds = service_account.Credentials.from_service_account_info(self.credentials)
+                _service_account_cache[key] = creds
+            self.client = speech.SpeechAsyncClient(credentials=creds)
             
             print_colored("✅ Google Speech client initialized successfully", Colors.SUCCESS)
             return True
@@ -237,121 +350,300 @@ class GoogleSTTTester:
             print_colored(f"❌ Failed to initialize Google Speech client: {e}", Colors.ERROR)
             return False
     
-    def test_microphone(self):
+    async def close(self):
+        """Close the client's gRPC channel"""
+        if self.client is not None:
+            await self.client.transport.close()
+            self.client = None
+    
+    def create_session(self, audio_source: str, chunk_ms: int = DEFAULT_CHUNK_MS) -> "SttSession":
+        """Create a streaming session that shares this tester's client"""
+        return SttSession(self.client, self.language, audio_source, chunk_ms)
+
+
+class SttSession:
+    """One streaming recognition session over a shared Speech client"""
+    
+    def __init__(self, client, language: str, audio_source: str, chunk_ms: int = DEFAULT_CHUNK_MS):
+        self.client = client
+        self.language = language
+        self.audio_source = audio_source
+        self.chunk_ms = chunk_ms
+        self.streaming_config = streaming_config_for(language)
+        self.requests = None
+        self.responses = None
+        self.is_recording = False
+    
+    async def run(self):
+        """Stream the session's audio source and print its transcripts"""
+        if self.audio_source == "microphone":
+            self.is_recording = True
+            await self.test_microphone()
+        else:
+            await self.test_audio_file(self.audio_source)
+    
+    async def test_microphone(self):
         """Test with microphone input"""
         print_colored("\n🎤 Starting microphone test...", Colors.HEADER)
         print("Speak into your microphone. Press Ctrl+C to stop.")
         
         # Audio configuration
-        CHUNK = 1024
-        FORMAT = pyaudio.paInt16
         CHANNELS = 1
         RATE = 16000
+        CHUNK = int(RATE * self.chunk_ms / 1000)
         
-        # Initialize PyAudio
-        audio = pyaudio.PyAudio()
+        # 2 s of 16-bit audio so interpreter pauses don't drop samples
+        ring = AudioRingBuffer(RATE * 2 * 2)
+        
+        def callback(indata, frames, time_info, status):
+            ring.write(indata)
         
         try:
-            # Open microphone stream
-            stream = audio.open(
-                format=FORMAT,
+            # Open microphone stream; PortAudio fills the ring from its own thread.
+            # The context manager starts it and always stops and closes it on exit
+            with sd.RawInputStream(
+                samplerate=RATE,
+                blocksize=CHUNK,
+                dtype='int16',
                 channels=CHANNELS,
-                rate=RATE,
-                input=True,
-                frames_per_buffer=CHUNK
-            )
-            
-            print_colored("🎤 Microphone ready. Start speaking...", Colors.SUCCESS)
-            
-            # Start streaming recognition
-            self.requests = (speech.StreamingRecognizeRequest(audio_content=chunk)
-                           for chunk in self.audio_generator(stream, CHUNK))
-            
-            self.responses = self.client.streaming_recognize(self.streaming_config, self.requests)
-            
-            # Process responses
-            self.process_responses()
-            
-        except KeyboardInterrupt:
+                callback=callback
+            ):
+                print_colored("🎤 Microphone ready. Start speaking...", Colors.SUCCESS)
+                
+                # Start streaming recognition; requests and responses both flow on the event loop
+                self.requests = self.with_config(self.audio_generator(ring, CHUNK * 2))
+                self.responses = await self.client.streaming_recognize(requests=self.requests)
+                
+                # Process responses
+                await self.process_responses()
+                
+        except (KeyboardInterrupt, asyncio.CancelledError):
             print_colored("\n⏹️  Stopping microphone test...", Colors.WARNING)
+            raise
         except Exception as e:
             print_colored(f"❌ Microphone test error: {e}", Colors.ERROR)
         finally:
-            if 'stream' in locals():
-                stream.stop_stream()
-                stream.close()
-            audio.terminate()
+            # Ends the request stream so the response iterator can finish
+            self.is_recording = False
     
-    def test_audio_file(self, file_path: str):
+    async def test_audio_file(self, file_path: str):
         """Test with audio file"""
         print_colored(f"\n📁 Testing audio file: {file_path}", Colors.HEADER)
         
         try:
-            # Read audio file
+            # Stream audio file
             with wave.open(file_path, 'rb') as audio_file:
-                frames = audio_file.readframes(-1)
                 sample_rate = audio_file.getframerate()
+                size = audio_file.getnframes() * audio_file.getsampwidth() * audio_file.getnchannels()
                 
-                print_colored(f"📊 Audio file info: {sample_rate}Hz, {len(frames)} bytes", Colors.INFO)
+                print_colored(f"📊 Audio file info: {sample_rate}Hz, {size} bytes", Colors.INFO)
                 
-                # Convert to chunks
-                chunk_size = 1024 * 2  # 1024 samples * 2 bytes per sample
-                audio_chunks = [frames[i:i+chunk_size] for i in range(0, len(frames), chunk_size)]
+                if audio_file.getsampwidth() != 2 or audio_file.getnchannels() != 1:
+                    raise ValueError("Only 16-bit mono WAV files are supported")
+                if sample_rate != 16000:
+                    if audioop is None:
+                        raise ValueError(f"Resampling {sample_rate}Hz audio needs audioop (Python < 3.13); "
+                                         "convert the file to 16000Hz first")
+                    print_colored(f"🔁 Resampling {sample_rate}Hz to 16000Hz", Colors.INFO)
                 
-                # Start streaming recognition
-                self.requests = (speech.StreamingRecognizeRequest(audio_content=chunk)
-                               for chunk in audio_chunks)
-                
-                self.responses = self.client.streaming_recognize(self.streaming_config, self.requests)
+                # Start streaming recognition; chunks are sized in source frames
+                chunk_size = int(sample_rate * self.chunk_ms / 1000)
+                self.requests = self.with_config(
+                    speech.StreamingRecognizeRequest(audio_content=chunk)
+                    async for chunk in self.file_generator(audio_file, chunk_size))
+                self.responses = await self.client.streaming_recognize(requests=self.requests)
                 
                 # Process responses
-                self.process_responses()
+                await self.process_responses()
                 
         except Exception as e:
             print_colored(f"❌ Audio file test error: {e}", Colors.ERROR)
     
-    def audio_generator(self, stream, chunk_size):
-        """Generate audio chunks from microphone stream"""
+    async def with_config(self, requests):
+        """Yield the streaming config request, then the audio requests"""
+        # The async client has no config helper, so the config goes first in the stream
+        yield speech.StreamingRecognizeRequest(streaming_config=self.streaming_config)
+        async for request in requests:
+            yield request
+    
+    async def audio_generator(self, ring: AudioRingBuffer, chunk_bytes: int):
+        """Generate requests from microphone ring buffer, skipping silence when VAD is available"""
+        Request = speech.StreamingRecognizeRequest
+        vad = webrtcvad.Vad(3) if webrtcvad else None
+        preroll = collections.deque(maxlen=VAD_PREROLL_CHUNKS)
+        hangover = 0
+        last_sent = time.monotonic()
+        
+        # Without VAD every chunk is sent, so quiet ones reuse one prebuilt silent request;
+        # it still carries audio, which keeps Google from closing the stream
+        silent_request = Request(audio_content=bytes(chunk_bytes))
+        
         while self.is_recording:
-            data = stream.read(chunk_size, exception_on_overflow=False)
+            # The ring read blocks on PortAudio's thread, so it waits off the event loop
+            data = await asyncio.to_thread(ring.read, chunk_bytes, 1.0)
+            if data is None:
+                continue
+            
+            if vad is None:
+                if chunk_rms(data) < SILENCE_RMS_THRESHOLD:
+                    yield silent_request
+                else:
+                    yield Request(audio_content=data)
+                continue
+            
+            if contains_speech(vad, data):
+                # Send the pre-roll first so the speech onset isn't clipped
+                while preroll:
+                    yield Request(audio_content=preroll.popleft())
+                hangover = VAD_HANGOVER_CHUNKS
+            elif hangover > 0:
+                hangover -= 1
+            elif time.monotonic() - last_sent < VAD_KEEPALIVE_SECONDS:
+                preroll.append(data)
+                continue
+            else:
+                # Keepalive: the held pre-roll is older than this chunk, so it is dropped
+                # rather than sent out of order at the next speech onset
+                preroll.clear()
+            
+            last_sent = time.monotonic()
+            yield Request(audio_content=data)
+    
+    async def file_generator(self, audio_file, chunk_size: int):
+        """Generate 16 kHz audio chunks read from a WAV file, paced to real time"""
+        sample_rate = audio_file.getframerate()
+        state = None
+        
+        # Google's streaming endpoint expects roughly real-time input; sleeping slightly
+        # less than each chunk's duration keeps the stream just ahead of the audio clock
+        chunk_seconds = chunk_size / sample_rate
+        while True:
+            data = audio_file.readframes(chunk_size)
+            if not data:
+                return
+            if sample_rate != 16000:
+                # Filter state carries across chunks so boundaries stay seamless
+                data, state = audioop.ratecv(data, 2, 1, sample_rate, 16000, state)
             yield data
+            await asyncio.sleep(chunk_seconds * 0.95)
     
-    def process_responses(self):
+    async def process_responses(self):
         """Process streaming recognition responses"""
+        # Responses are consumed without waiting on the terminal;
+        # the renderer shows every final but only the newest interim
+        self._finals = queue.SimpleQueue()
+        self._interim = collections.deque(maxlen=1)
+        self._responses_done = asyncio.Event()
+        self._response_error = None
+        await asyncio.gather(
+            self._consume_responses(),
+            self._render_loop(),
+        )
+    
+    async def _consume_responses(self):
+        """Pull responses from gRPC into the finals queue and the interim slot"""
+        # Locals avoid repeated attribute lookups on the per-response path
+        put_final, put_interim, clear_interim = self._finals.put, self._interim.append, self._interim.clear
         try:
-            for response in self.responses:
-                if not response.results:
+            async for response in self.responses:
+                response_results = response.results
+                if not response_results:
                     continue
                 
-                result = response.results[0]
-                if not result.alternatives:
+                result = response_results[0]
+                alternatives = result.alternatives
+                if not alternatives:
                     continue
                 
-                transcript = result.alternatives[0].transcript
-                confidence = result.alternatives[0].confidence
-                is_final = result.is_final
-                
-                # Color code based on finality
-                if is_final:
-                    color = Colors.SUCCESS
-                    prefix = "✅ FINAL"
+                alternative = alternatives[0]
+                if result.is_final:
+                    # A final supersedes any interim still waiting to be shown
+                    clear_interim()
+                    put_final((alternative.transcript, alternative.confidence))
                 else:
-                    color = Colors.WARNING
-                    prefix = "🔄 INTERIM"
-                
-                # Format confidence
-                conf_str = f"({confidence:.2f})" if confidence else "(N/A)"
-                
-                # Print result
-                timestamp = datetime.now().strftime("%H:%M:%S")
-                print_colored(f"[{timestamp}] {prefix} {conf_str}: {transcript}", color)
+                    put_interim((alternative.transcript, alternative.confidence))
                 
         except Exception as e:
-            print_colored(f"❌ Error processing responses: {e}", Colors.ERROR)
+            self._response_error = e
+        finally:
+            self._responses_done.set()
+    
+    async def _render_loop(self):
+        """Print pending finals and the newest interim every 50 ms until responses end"""
+        write, flush = sys.stdout.write, sys.stdout.flush
+        get_final, interim = self._finals.get_nowait, self._interim
+        SUCCESS, WARNING, RESET = Colors.SUCCESS, Colors.WARNING, Colors.RESET
+        ts_sec, ts_str = None, ""
+        
+        def stamp():
+            nonlocal ts_sec, ts_str
+            now = int(time.time())
+            if now != ts_sec:
+                ts_sec, ts_str = now, time.strftime("%H:%M:%S", time.localtime(now))
+            return ts_str
+        
+        while True:
+            # Checked before draining so nothing queued ahead of the end is missed
+            done = self._responses_done.is_set()
+            wrote = False
+            
+            # Finals print on their own lines; the interim overwrites the current line in place
+            while True:
+                try:
+                    transcript, confidence = get_final()
+                except queue.Empty:
+                    break
+                conf_str = f"({confidence:.2f})" if confidence else "(N/A)"
+                write(f"\r\033[K{SUCCESS}[{stamp()}] ✅ FINAL {conf_str}: {transcript}{RESET}\n")
+                wrote = True
+            
+            try:
+                transcript, confidence = interim.pop()
+            except IndexError:
+                pass
+            else:
+                conf_str = f"({confidence:.2f})" if confidence else "(N/A)"
+                write(f"\r\033[K{WARNING}[{stamp()}] 🔄 INTERIM {conf_str}: {transcript}{RESET}")
+                wrote = True
+            
+            if wrote:
+                flush()
+            if done:
+                break
+            await asyncio.sleep(0.05)
+        
+        if self._response_error:
+            print_colored(f"\n❌ Error processing responses: {self._response_error}", Colors.ERROR)
+
+
+async def run_sessions(sessions):
+    """Run sessions concurrently; they share one client and its HTTP/2 channel"""
+    await asyncio.gather(*(session.run() for session in sessions))
+
+
+async def run_test(tester: GoogleSTTTester, audio_input: str, chunk_ms: int) -> bool:
+    """Initialize the tester's client on the running loop, then run the test session"""
+    if not await tester.initialize():
+        return False
+    try:
+        await run_sessions([tester.create_session(audio_input, chunk_ms)])
+    finally:
+        await tester.close()
+    return True
 
 
 def main():
     """Main application"""
+    parser = argparse.ArgumentParser(description="Google Speech-to-Text standalone test")
+    parser.add_argument("--chunk-ms", type=int, default=DEFAULT_CHUNK_MS,
+                        help=f"milliseconds of audio per streaming request (default: {DEFAULT_CHUNK_MS})")
+    args = parser.parse_args()
+    if not MIN_CHUNK_MS <= args.chunk_ms <= MAX_CHUNK_MS:
+        parser.error(f"--chunk-ms must be between {MIN_CHUNK_MS} and {MAX_CHUNK_MS}")
+    if webrtcvad and args.chunk_ms % MIN_CHUNK_MS:
+        # VAD only looks at whole 20 ms frames, so a partial trailing frame would go unchecked
+        parser.error(f"--chunk-ms must be a multiple of {MIN_CHUNK_MS} when webrtcvad is installed")
+    
     print_colored("🎯 Google Speech-to-Text Standalone Test", Colors.HEADER)
     print("=" * 50)
     
@@ -371,21 +663,15 @@ def main():
         print_colored("❌ Invalid audio input. Exiting.", Colors.ERROR)
         return 1
     
-    # Initialize tester
+    # Initialize tester and run test
     tester = GoogleSTTTester(credentials, language)
-    if not tester.initialize():
-        return 1
-    
-    # Run test
     try:
-        if audio_input == "microphone":
-            tester.is_recording = True
-            tester.test_microphone()
-        else:
-            tester.test_audio_file(audio_input)
+        if not asyncio.run(run_test(tester, audio_input, args.chunk_ms)):
+            return 1
             
     except KeyboardInterrupt:
         print_colored("\n👋 Test interrupted by user", Colors.WARNING)
+        return 130
     except Exception as e:
         print_colored(f"❌ Test failed: {e}", Colors.ERROR)
         return 1